@@ -12,24 +12,56 @@ Features:
 
 from __future__ import annotations
 
+import functools
 import tkinter as tk
 from decimal import Decimal, InvalidOperation, getcontext
 
 
-getcontext().prec = 40
+getcontext().prec = 20
 
+_ZERO = Decimal(0)
+_HUNDRED = Decimal(100)
+# Display strings that are still "nothing typed yet" and parse as zero.
+_EMPTY_TEXTS = frozenset({"", "-", ".", "-.", "0.", "-0."})
 
+# Operator button label -> internal operator.
+_OP_LABEL_MAP = {"÷": "/", "×": "*", "−": "-", "+": "+", "=": "="}
+
+# Presses of the same key closer together than this (ms, by Tk event
+# timestamp) are treated as OS auto-repeat and dropped.
+_KEY_REPEAT_THRESHOLD = 30
+
+# Integer results at or beyond this magnitude are handed back to Decimal so
+# they round like any other result instead of growing without bound.
+_INT_LIMIT = 10 ** getcontext().prec
+
+
+@functools.lru_cache(maxsize=256)
 def _decimal_from_text(text: str) -> Decimal:
 	# Accept display strings like "0" or "-0.".
-	if text in {"", "-", ".", "-.", "0.", "-0."}:
-		return Decimal(0)
+	if text in _EMPTY_TEXTS:
+		return _ZERO
 	try:
 		return Decimal(text)
 	except InvalidOperation:
-		return Decimal(0)
+		return _ZERO
 
 
-def _format_decimal(value: Decimal) -> str:
+def _parse_number(text: str) -> int | Decimal:
+	# Whole-number entries stay native ints; Decimal only when a '.' is typed.
+	if "." not in text and text not in _EMPTY_TEXTS:
+		try:
+			return int(text)
+		except ValueError:
+			pass
+	return _decimal_from_text(text)
+
+
+# Cached: repeated '=' and operator presses on the same value hit the cache.
+@functools.lru_cache(maxsize=512)
+def _format_decimal(value: int | Decimal) -> str:
+	if isinstance(value, int):
+		return str(value)
 	# Avoid scientific notation for typical calculator ranges.
 	# Normalize trims trailing zeros but can produce exponent; force fixed-point.
 	if value.is_nan():
@@ -46,6 +78,16 @@ def _format_decimal(value: Decimal) -> str:
 	return sign + (text if text else "0")
 
 
+# Button-like configure() options handled by RoundedButton -> attribute.
+_BUTTON_STYLE_OPTIONS = (
+	("text", "_text"),
+	("bg", "_bg"),
+	("fg", "_fg"),
+	("activebackground", "_active_bg"),
+	("activeforeground", "_active_fg"),
+)
+
+
 class RoundedButton(tk.Canvas):
 	def __init__(
 		self,
@@ -79,15 +121,19 @@ class RoundedButton(tk.Canvas):
 		self._active_bg = activebackground if activebackground is not None else bg
 		self._active_fg = activeforeground if activeforeground is not None else fg
 		self._pressed = False
+		self._shape_ids: list[int] = []
+		self._text_id = 0
 
-		self.configure(cursor="hand2")
+		self._create_items()
 		self._draw()
+		self.configure(cursor="hand2")
 
 		self.bind("<ButtonPress-1>", self._on_press)
 		self.bind("<ButtonRelease-1>", self._on_release)
 		self.bind("<Leave>", self._on_leave)
 
-	def _draw(self) -> None:
+	def _create_items(self) -> None:
+		# Items are created once per size; _draw only restyles them.
 		self.delete("all")
 		pad = 2
 		x0, y0 = pad, pad
@@ -95,30 +141,31 @@ class RoundedButton(tk.Canvas):
 		w = x1 - x0
 		h = y1 - y0
 
-		fill = self._active_bg if self._pressed else self._bg
-		outline = fill
-
 		# Circle when square-ish, pill when wide.
 		if w <= h + 2:
-			self.create_oval(x0, y0, x1, y1, fill=fill, outline=outline, tags=("shape",))
+			self._shape_ids = [self.create_oval(x0, y0, x1, y1, tags=("shape",))]
 		else:
 			r = h / 2
-			self.create_oval(x0, y0, x0 + 2 * r, y1, fill=fill, outline=outline, tags=("shape",))
-			self.create_oval(x1 - 2 * r, y0, x1, y1, fill=fill, outline=outline, tags=("shape",))
-			self.create_rectangle(x0 + r, y0, x1 - r, y1, fill=fill, outline=outline, tags=("shape",))
+			self._shape_ids = [
+				self.create_oval(x0, y0, x0 + 2 * r, y1, tags=("shape",)),
+				self.create_oval(x1 - 2 * r, y0, x1, y1, tags=("shape",)),
+				self.create_rectangle(x0 + r, y0, x1 - r, y1, tags=("shape",)),
+			]
 
-		fg = self._active_fg if self._pressed else self._fg
-		self.create_text(
+		self._text_id = self.create_text(
 			self._width / 2,
 			self._height / 2,
-			text=self._text,
-			fill=fg,
 			font=self._font,
 			tags=("text",),
 		)
 
-	def _hit_test(self, x: int, y: int) -> bool:
-		return 0 <= x <= self._width and 0 <= y <= self._height
+	def _draw(self) -> None:
+		fill = self._active_bg if self._pressed else self._bg
+		for shape_id in self._shape_ids:
+			self.itemconfigure(shape_id, fill=fill, outline=fill)
+
+		fg = self._active_fg if self._pressed else self._fg
+		self.itemconfigure(self._text_id, text=self._text, fill=fg, font=self._font)
 
 	def _on_press(self, event: tk.Event) -> None:
 		self._pressed = True
@@ -128,7 +175,9 @@ class RoundedButton(tk.Canvas):
 		was_pressed = self._pressed
 		self._pressed = False
 		self._draw()
-		if was_pressed and self._hit_test(int(event.x), int(event.y)):
+		# Releasing outside the button is already handled by <Leave>, which
+		# clears _pressed before the release arrives.
+		if was_pressed:
 			self._command()
 
 	def _on_leave(self, _event: tk.Event) -> None:
@@ -138,23 +187,64 @@ class RoundedButton(tk.Canvas):
 
 	def configure(self, cnf=None, **kw):
 		# Support a subset of Button-like options so the rest of the app can
-		# update styles/text without knowing this is a Canvas.
-		if "text" in kw:
-			self._text = kw.pop("text")
-		if "bg" in kw:
-			self._bg = kw.pop("bg")
-		if "fg" in kw:
-			self._fg = kw.pop("fg")
-		if "activebackground" in kw:
-			self._active_bg = kw.pop("activebackground")
-		if "activeforeground" in kw:
-			self._active_fg = kw.pop("activeforeground")
-		result = super().configure(cnf or {}, **kw)
-		self._draw()
+		# update styles/text without knowing this is a Canvas. Only redraw
+		# when one of them actually changes.
+		changed = False
+		for option, attr in _BUTTON_STYLE_OPTIONS:
+			if option in kw:
+				value = kw.pop(option)
+				if value != getattr(self, attr):
+					setattr(self, attr, value)
+					changed = True
+		resized = False
+		if "width" in kw and kw["width"] != self._width:
+			self._width = kw["width"]
+			resized = True
+		if "height" in kw and kw["height"] != self._height:
+			self._height = kw["height"]
+			resized = True
+		# With no options left, Canvas.configure would be a full option query.
+		result = super().configure(cnf, **kw) if cnf or kw else None
+		if resized:
+			self._create_items()
+		if changed or resized:
+			self._draw()
 		return result
 
 
 class CalculatorApp:
+	__slots__ = (
+		"root",
+		# State
+		"accumulator",
+		"current_text",
+		"pending_op",
+		"last_op",
+		"last_operand",
+		"reset_next_entry",
+		"error_state",
+		# Paint scheduling
+		"_dirty",
+		"_paint_scheduled",
+		"_display_text",
+		"_highlight_op",
+		"_current_highlight",
+		"_clear_label_current",
+		# Input dispatch
+		"_digit_handlers",
+		"_op_handlers",
+		"_repeatable_keys",
+		"_key_table",
+		"_last_key_time",
+		# UI
+		"_display_label",
+		"_last_display_text",
+		"colors",
+		"_styles",
+		"clear_button",
+		"op_buttons",
+	)
+
 	def __init__(self, root: tk.Tk) -> None:
 		self.root = root
 		self.root.title("Calculator")
@@ -162,16 +252,53 @@ class CalculatorApp:
 		self.root.resizable(False, False)
 
 		# State
-		self.accumulator = Decimal(0)
+		self.accumulator: int | Decimal = 0
 		self.current_text = "0"  # what user is typing
 		self.pending_op: str | None = None
 		self.last_op: str | None = None
-		self.last_operand = Decimal(0)
+		self.last_operand: int | Decimal = 0
 		self.reset_next_entry = False
 		self.error_state = False
 
+		# Paint scheduling: handlers mark what changed, _flush applies it once
+		# per event-loop iteration.
+		self._dirty: set[str] = set()
+		self._paint_scheduled = False
+		self._display_text = self.current_text
+		self._highlight_op: str | None = None
+		self._current_highlight: str | None = None
+		self._clear_label_current = "AC"
+
+		# Handlers shared by the button layout and keyboard dispatch.
+		self._digit_handlers = {d: functools.partial(self.on_digit, d) for d in "0123456789"}
+		self._op_handlers = {o: functools.partial(self.on_operator, o) for o in "+-*/"}
+		# Keysym -> handler for every key we bind; digits and operators are
+		# "repeatable" and go through the auto-repeat filter.
+		op = self._op_handlers
+		self._repeatable_keys = {
+			**self._digit_handlers,
+			**{f"KP_{d}": h for d, h in self._digit_handlers.items()},
+			"plus": op["+"],
+			"KP_Add": op["+"],
+			"minus": op["-"],
+			"KP_Subtract": op["-"],
+			"asterisk": op["*"],
+			"KP_Multiply": op["*"],
+			"slash": op["/"],
+			"KP_Divide": op["/"],
+		}
+		self._key_table = {
+			**self._repeatable_keys,
+			"period": self.on_decimal,
+			"KP_Decimal": self.on_decimal,
+			"Return": self.on_equals,
+			"KP_Enter": self.on_equals,
+			"Escape": self.on_all_clear,
+			"BackSpace": self.on_backspace,
+		}
+		self._last_key_time: dict[str, int] = {}
+
 		# UI
-		self.display_var = tk.StringVar(value=self.current_text)
 		self._build_ui()
 		self._bind_keys()
 		self._refresh_clear_label()
@@ -180,7 +307,7 @@ class CalculatorApp:
 		# Display
 		display = tk.Label(
 			self.root,
-			textvariable=self.display_var,
+			text=self.current_text,
 			bg="#000000",
 			fg="#FFFFFF",
 			anchor="e",
@@ -189,6 +316,8 @@ class CalculatorApp:
 			font=("Segoe UI", 36),
 		)
 		display.grid(row=0, column=0, columnspan=4, sticky="nsew")
+		self._display_label = display
+		self._last_display_text = self.current_text
 
 		# Colors (approx iOS)
 		self.colors = {
@@ -201,18 +330,22 @@ class CalculatorApp:
 			"op_active_bg": "#FFFFFF",
 			"op_active_fg": "#FF9F0A",
 		}
+		# (bg, fg) per button kind, resolved once for _make_button.
+		self._styles = {k: (self.colors[f"{k}_bg"], self.colors[f"{k}_fg"]) for k in ("digit", "func", "op")}
 
 		# Button layout
 		# Each row: (label, kind, command)
 		self.clear_button: RoundedButton | None = None
 		self.op_buttons: dict[str, RoundedButton] = {}
 
+		digit = self._digit_handlers
+		op = self._op_handlers
 		layout = [
-			[("AC", "func", self.on_clear), ("±", "func", self.on_toggle_sign), ("%", "func", self.on_percent), ("÷", "op", lambda: self.on_operator("/"))],
-			[("7", "digit", lambda: self.on_digit("7")), ("8", "digit", lambda: self.on_digit("8")), ("9", "digit", lambda: self.on_digit("9")), ("×", "op", lambda: self.on_operator("*"))],
-			[("4", "digit", lambda: self.on_digit("4")), ("5", "digit", lambda: self.on_digit("5")), ("6", "digit", lambda: self.on_digit("6")), ("−", "op", lambda: self.on_operator("-"))],
-			[("1", "digit", lambda: self.on_digit("1")), ("2", "digit", lambda: self.on_digit("2")), ("3", "digit", lambda: self.on_digit("3")), ("+", "op", lambda: self.on_operator("+"))],
-			[("0", "digit", lambda: self.on_digit("0")), (".", "digit", self.on_decimal), ("=", "op", self.on_equals)],
+			[("AC", "func", self.on_clear), ("±", "func", self.on_toggle_sign), ("%", "func", self.on_percent), ("÷", "op", op["/"])],
+			[("7", "digit", digit["7"]), ("8", "digit", digit["8"]), ("9", "digit", digit["9"]), ("×", "op", op["*"])],
+			[("4", "digit", digit["4"]), ("5", "digit", digit["5"]), ("6", "digit", digit["6"]), ("−", "op", op["-"])],
+			[("1", "digit", digit["1"]), ("2", "digit", digit["2"]), ("3", "digit", digit["3"]), ("+", "op", op["+"])],
+			[("0", "digit", digit["0"]), (".", "digit", self.on_decimal), ("=", "op", self.on_equals)],
 		]
 
 		# Configure grid weights for consistent sizing
@@ -235,50 +368,19 @@ class CalculatorApp:
 				btn.grid(row=r, column=col, sticky="nsew", padx=6, pady=6)
 				col += 1
 
-				if label in {"÷", "×", "−", "+", "="}:
-					# Map UI label to internal operator
-					if label == "÷":
-						self.op_buttons["/"] = btn
-					elif label == "×":
-						self.op_buttons["*"] = btn
-					elif label == "−":
-						self.op_buttons["-"] = btn
-					elif label == "+":
-						self.op_buttons["+"] = btn
-					elif label == "=":
-						self.op_buttons["="] = btn
+				internal = _OP_LABEL_MAP.get(label)
+				if internal:
+					self.op_buttons[internal] = btn
 
 				if label == "AC":
 					self.clear_button = btn
 
 	def _make_button(self, label: str, kind: str, cmd, *, wide: bool = False) -> RoundedButton:
-		if kind == "digit":
-			bg = self.colors["digit_bg"]
-			fg = self.colors["digit_fg"]
-		elif kind == "func":
-			bg = self.colors["func_bg"]
-			fg = self.colors["func_fg"]
-		else:
-			bg = self.colors["op_bg"]
-			fg = self.colors["op_fg"]
+		bg, fg = self._styles[kind]
 
 		# Size tuned to look more like iPhone circles/pills.
 		height = 84
-		width = 84
-		if wide:
-			width = 84 * 2 + 12
-			return RoundedButton(
-				self.root,
-				text=label,
-				command=cmd,
-				width=width,
-				height=height,
-				bg=bg,
-				fg=fg,
-				activebackground=bg,
-				activeforeground=fg,
-				font=("Segoe UI", 20),
-			)
+		width = 84 * 2 + 12 if wide else 84
 		return RoundedButton(
 			self.root,
 			text=label,
@@ -293,98 +395,141 @@ class CalculatorApp:
 		)
 
 	def _bind_keys(self) -> None:
-		self.root.bind("<Key>", self._on_key)
+		# Bind only the keys we handle so Tk filters everything else.
+		for keysym in self._key_table:
+			self.root.bind(f"<KeyPress-{keysym}>", self._on_key)
+		for keysym in self._repeatable_keys:
+			self.root.bind(f"<KeyRelease-{keysym}>", self._on_key_release)
+
+	def _on_key_release(self, event: tk.Event) -> None:
+		self._last_key_time[event.keysym] = event.time
 
 	def _on_key(self, event: tk.Event) -> None:
-		ch = event.char
 		keysym = event.keysym
-
-		if keysym in {"Return", "KP_Enter"}:
-			self.on_equals()
-			return
-		if keysym == "Escape":
-			self.on_all_clear()
-			return
-		if keysym == "BackSpace":
-			self.on_backspace()
-			return
-
-		if ch.isdigit():
-			self.on_digit(ch)
-			return
-		if ch == ".":
-			self.on_decimal()
-			return
-		if ch in {"+", "-", "*", "/"}:
-			self.on_operator(ch)
-			return
+		if keysym in self._repeatable_keys:
+			# Held digit/operator keys: only the first press counts. Use the
+			# event timestamp so a backed-up event loop doesn't make distinct
+			# presses look like repeats.
+			now = event.time
+			last = self._last_key_time.get(keysym)
+			self._last_key_time[keysym] = now
+			if last is not None and 0 <= now - last < _KEY_REPEAT_THRESHOLD:
+				return
+		self._key_table[keysym]()
 
 	def _set_display(self, text: str) -> None:
-		self.display_var.set(text)
+		self._display_text = text
+		self._mark_dirty("display")
+
+	def _mark_dirty(self, part: str) -> None:
+		self._dirty.add(part)
+		if not self._paint_scheduled:
+			self._paint_scheduled = True
+			self.root.after_idle(self._flush)
+
+	def _flush(self) -> None:
+		dirty = self._dirty
+		self._dirty = set()
+		self._paint_scheduled = False
+		if "display" in dirty:
+			self._paint_display()
+		if "highlight" in dirty:
+			self._paint_op_highlight()
+		if "clear" in dirty:
+			self._paint_clear_label()
+
+	def _paint_display(self) -> None:
+		# Configure the label directly; a StringVar would go through Tcl traces.
+		text = self._display_text
+		if text != self._last_display_text:
+			self._display_label.configure(text=text)
+			self._last_display_text = text
 
 	def _set_error(self) -> None:
 		self.error_state = True
 		self.pending_op = None
 		self.last_op = None
-		self.last_operand = Decimal(0)
+		self.last_operand = 0
 		self.reset_next_entry = True
 		self._set_display("Error")
 		self._update_op_highlight(None)
 		self._refresh_clear_label()
 
 	def _refresh_clear_label(self) -> None:
+		self._mark_dirty("clear")
+
+	def _paint_clear_label(self) -> None:
 		if not self.clear_button:
 			return
 		if self.error_state:
-			self.clear_button.configure(text="AC")
-			return
-		# iPhone style: AC when fully reset, C otherwise.
-		is_all_clear = (
-			self.current_text == "0"
-			and self.accumulator == 0
-			and self.pending_op is None
-			and not self.reset_next_entry
-		)
-		self.clear_button.configure(text="AC" if is_all_clear else "C")
+			label = "AC"
+		else:
+			# iPhone style: AC when fully reset, C otherwise.
+			is_all_clear = (
+				self.current_text == "0"
+				and self.accumulator == 0
+				and self.pending_op is None
+				and not self.reset_next_entry
+			)
+			label = "AC" if is_all_clear else "C"
+		if label != self._clear_label_current:
+			self.clear_button.configure(text=label)
+			self._clear_label_current = label
 
 	def _update_op_highlight(self, op: str | None) -> None:
-		for k, btn in self.op_buttons.items():
-			if k == "=":
-				# Don't highlight '='
-				continue
-			if op is not None and k == op:
-				btn.configure(
-					bg=self.colors["op_active_bg"],
-					fg=self.colors["op_active_fg"],
-					activebackground=self.colors["op_active_bg"],
-					activeforeground=self.colors["op_active_fg"],
-				)
-			else:
-				btn.configure(
-					bg=self.colors["op_bg"],
-					fg=self.colors["op_fg"],
-					activebackground=self.colors["op_bg"],
-					activeforeground=self.colors["op_fg"],
-				)
-
-	def _commit_pending(self, rhs: Decimal) -> None:
+		self._highlight_op = op
+		self._mark_dirty("highlight")
+
+	def _paint_op_highlight(self) -> None:
+		op = self._highlight_op
+		if op == self._current_highlight:
+			return
+		# Only the previously and newly highlighted buttons change state.
+		old_btn = self.op_buttons.get(self._current_highlight)
+		if old_btn is not None:
+			old_btn.configure(
+				bg=self.colors["op_bg"],
+				fg=self.colors["op_fg"],
+				activebackground=self.colors["op_bg"],
+				activeforeground=self.colors["op_fg"],
+			)
+		# Don't highlight '='
+		new_btn = self.op_buttons.get(op) if op != "=" else None
+		if new_btn is not None:
+			new_btn.configure(
+				bg=self.colors["op_active_bg"],
+				fg=self.colors["op_active_fg"],
+				activebackground=self.colors["op_active_bg"],
+				activeforeground=self.colors["op_active_fg"],
+			)
+		self._current_highlight = op
+
+	def _commit_pending(self, rhs: int | Decimal) -> None:
 		if self.pending_op is None:
 			self.accumulator = rhs
 			return
 
+		# int op int stays int for + - *; any Decimal operand promotes the
+		# result, and division always goes through Decimal.
 		try:
 			if self.pending_op == "+":
-				self.accumulator = self.accumulator + rhs
+				result = self.accumulator + rhs
 			elif self.pending_op == "-":
-				self.accumulator = self.accumulator - rhs
+				result = self.accumulator - rhs
 			elif self.pending_op == "*":
-				self.accumulator = self.accumulator * rhs
+				result = self.accumulator * rhs
 			elif self.pending_op == "/":
 				if rhs == 0:
 					raise ZeroDivisionError
-				self.accumulator = self.accumulator / rhs
+				result = Decimal(self.accumulator) / rhs
+			else:
+				return
 		except ZeroDivisionError:
 			self._set_error()
+			return
+		if isinstance(result, int) and abs(result) >= _INT_LIMIT:
+			result = +Decimal(result)
+		self.accumulator = result
 
 	def on_digit(self, digit: str) -> None:
 		if self.error_state:
@@ -437,7 +582,7 @@ class CalculatorApp:
 		if op not in {"+", "-", "*", "/"}:
 			return
 
-		rhs = _decimal_from_text(self.current_text)
+		rhs = _parse_number(self.current_text)
 
 		# If user presses operator repeatedly, just change pending op.
 		if self.pending_op is not None and self.reset_next_entry:
@@ -454,8 +599,9 @@ class CalculatorApp:
 
 		self.pending_op = op
 		self.last_op = None
-		self._set_display(_format_decimal(self.accumulator))
-		self.current_text = _format_decimal(self.accumulator)
+		formatted = _format_decimal(self.accumulator)
+		self.current_text = formatted
+		self._set_display(formatted)
 		self.reset_next_entry = True
 		self._update_op_highlight(op)
 		self._refresh_clear_label()
@@ -463,10 +609,19 @@ class CalculatorApp:
 	def on_equals(self) -> None:
 		if self.error_state:
 			return
+		# Nothing pending and nothing to repeat: tidy the typed entry (e.g.
+		# "3." -> "3"), and the next digit still starts a fresh entry.
+		if self.pending_op is None and self.last_op is None:
+			formatted = _format_decimal(_parse_number(self.current_text))
+			self.current_text = formatted
+			self._set_display(formatted)
+			self.reset_next_entry = True
+			self._refresh_clear_label()
+			return
 
 		# If there's a pending op, compute it with current entry.
 		if self.pending_op is not None:
-			rhs = _decimal_from_text(self.current_text)
+			rhs = _parse_number(self.current_text)
 			op = self.pending_op
 			self._commit_pending(rhs)
 			if self.error_state:
@@ -477,23 +632,23 @@ class CalculatorApp:
 			self._update_op_highlight(None)
 		else:
 			# Repeat last operation on successive '='
-			if self.last_op is not None:
-				self.pending_op = self.last_op
-				self._commit_pending(self.last_operand)
-				self.pending_op = None
-				if self.error_state:
-					return
-
-		self.current_text = _format_decimal(self.accumulator)
-		self._set_display(self.current_text)
+			self.pending_op = self.last_op
+			self._commit_pending(self.last_operand)
+			self.pending_op = None
+			if self.error_state:
+				return
+
+		formatted = _format_decimal(self.accumulator)
+		self.current_text = formatted
+		self._set_display(formatted)
 		self.reset_next_entry = True
 		self._refresh_clear_label()
 
 	def on_percent(self) -> None:
 		if self.error_state:
 			return
-		value = _decimal_from_text(self.current_text)
-		value = value / Decimal(100)
+		value = _parse_number(self.current_text)
+		value = value / _HUNDRED
 		self.current_text = _format_decimal(value)
 		self._set_display(self.current_text)
 		self._refresh_clear_label()
@@ -534,11 +689,11 @@ class CalculatorApp:
 			self._refresh_clear_label()
 
 	def on_all_clear(self) -> None:
-		self.accumulator = Decimal(0)
+		self.accumulator = 0
 		self.current_text = "0"
 		self.pending_op = None
 		self.last_op = None
-		self.last_operand = Decimal(0)
+		self.last_operand = 0
 		self.reset_next_entry = False
 		self.error_state = False
 		self._update_op_highlight(None)